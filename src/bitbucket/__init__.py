@@ -1,17 +1,17 @@
 """Access to Octopus APi see """
 import logging
-from enum import Enum
 from logging import NullHandler
-from typing import Any, Dict
-
-import requests
 
 from . import exceptions, resource, tool
 
 logging.getLogger(__name__).addHandler(NullHandler())
 
 class API():
-    """Class for interacting with the Bitbucket resources"""
+    """Class for interacting with the Bitbucket resources
+
+    Every resource handed back shares this object's session, so reuse a
+    single API instance to keep its pooled connections warm.
+    """
     logger = logging.getLogger(__name__)
 
     def __init__(
@@ -27,10 +27,31 @@ class API():
         """
         self.bitbucket_workspace = bitbucket_workspace
         self.bitbucket_url = bitbucket_url
+        self._repositories_url = f'{bitbucket_url}/repositories/{bitbucket_workspace}'
+        self._connections = {}
 
-        self.session = requests.Session()
+        self.session = tool.create_session()
         self.session.auth = (username, password)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Release the pooled connections held by the underlying session"""
+        self.session.close()
+
+    def _connection(self, url_base: str) -> tool.Connection:
+        """Connection for url_base, built once and then reused"""
+        if url_base not in self._connections:
+            self._connections[url_base] = tool.Connection(
+                session=self.session,
+                url_base=url_base)
+
+        return self._connections[url_base]
+
     def get_repositories(self, parameters: dict=None) -> tool.Pages:
         """Lists all of the repositories for a workspace.
 
@@ -41,15 +62,10 @@ class API():
         Returns:
             tool.Pages: Generator for Repository objects
         """
-        url = '/'.join([
-            self.bitbucket_url,
-            'repositories',
-            self.bitbucket_workspace])
+        url = self._repositories_url
 
         pages = tool.Pages(
-            connection=tool.Connection(
-                session=self.session,
-                url_base=url),
+            connection=self._connection(url),
             url=url,
             parameters=parameters,
             resource=resource.Repository)
@@ -68,24 +84,15 @@ class API():
             resource.Repository: Repository object representing the repository
                 found within the workspace.
         """
-        url = '/'.join([
-            self.bitbucket_url,
-            'repositories',
-            self.bitbucket_workspace,
-            repository_name])
+        url = f'{self._repositories_url}/{repository_name}'
 
         response = self.session.get(url, params=parameters)
 
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as error:
-            raise exceptions.ObjectDoesNotExist(*error.args, **error.__dict__) from error
+        tool.check_response(response, exceptions.ObjectDoesNotExist)
 
         repository = resource.Repository(
-            connection=tool.Connection(
-                session=self.session,
-                url_base=url),
-            **response.json())
+            connection=self._connection(url),
+            **tool.parse_json(response))
 
         return repository
 
@@ -98,17 +105,10 @@ class API():
         Returns:
             tool.Pages: Generator for Pipeline objects
         """
-        url = '/'.join([
-            self.bitbucket_url,
-            'repositories',
-            self.bitbucket_workspace,
-            repository_name.lower(),
-            'pipelines/'])
+        url = f'{self._repositories_url}/{repository_name.lower()}/pipelines/'
 
         pages = tool.Pages(
-            connection=tool.Connection(
-                session=self.session,
-                url_base=url),
+            connection=self._connection(url),
             url=url,
             parameters=parameters,
             resource=resource.Pipeline)
@@ -1,7 +1,9 @@
 """Classes representing Bitbucket resources"""
+import functools
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from types import SimpleNamespace
 from typing import Union
 
 import requests
@@ -10,115 +12,194 @@ from . import exceptions
 from . import tool
 
 
+@functools.lru_cache(maxsize=4096)
+def _fetch_commit(session: requests.sessions.Session, url: str) -> dict:
+    """Retrieve the JSON for a commit URL.
+
+    A commit URL names a hash whose content never changes, so responses are
+    cached per session and URL.
+    """
+    response = session.get(url)
+    response.raise_for_status()
+
+    return tool.parse_json(response)
+
+
+@tool.ttl_lru_cache(maxsize=512, ttl=60)
+def _fetch_object(session: requests.sessions.Session, url: str) -> dict:
+    """Retrieve the JSON for a single branch, tag or pullrequest URL.
+
+    Repeat lookups within a minute are answered from the cache; creating,
+    deleting or merging through this module clears it.
+
+    Raises:
+        exceptions.ObjectDoesNotExist: Bitbucket did not return the object.
+    """
+    response = session.get(url)
+
+    tool.check_response(response, exceptions.ObjectDoesNotExist)
+
+    return tool.parse_json(response)
+
+
+def _pages_from_link(
+        obj: "Base", link: str, resource, parameters: dict=None,
+        prefetch: bool = True, parallel: bool = False) -> tool.Pages:
+    """Iterator over the collection obj links to under links[link]"""
+    return tool.Pages(
+        connection=obj.connection,
+        url=obj.links[link]['href'],
+        parameters=parameters,
+        resource=resource,
+        prefetch=prefetch,
+        parallel=parallel)
+
+
+def _already_exists(response: requests.models.Response) -> bool:
+    """Whether a failed create was refused because the object already exists"""
+    if 'application/json' not in response.headers.get('Content-Type', ''):
+        return False
+
+    message = tool.parse_json(response).get('error', {}).get('message') or ''
+
+    return 'already exists' in message
+
+
+def _commit_hash_of(obj: Union[str, "Branch", "Commit", "Repository", None]) -> Union[str, None]:
+    """Hash of the commit obj refers to: a hash string as is, a Commit's hash,
+    a Branch's latest commit or a Repository's latest commit.
+    """
+    ### the exact type is found on the first pass; the rest of the MRO covers subclasses
+    for cls in type(obj).__mro__:
+        getter = _HASH_GETTERS.get(cls)
+        if getter:
+            return getter(obj)
+
+    return None
+
+
 class MixinBranchesFromLink(): # pylint: disable=too-few-public-methods
     """Mixin class used to add the ability to find multiple branches associated with the resource"""
-    def branches(self, parameters: dict=None) -> tool.Pages:
+    __slots__ = ()
+
+    def branches(
+            self, parameters: dict=None, prefetch: bool = True,
+            parallel: bool = True) -> tool.Pages:
         """Method for retrieving Branches from repository
 
+        Args:
+            parameters (dict, optional): Parameters used to query. Defaults to None.
+            prefetch (bool, optional): Request the next page while the current one
+                is consumed. Defaults to True.
+            parallel (bool, optional): Request every remaining page at once
+                after the first. Defaults to True.
+
         Returns:
             tool.Pages: Iterator that returns Branch objects
         """
-        pages = tool.Pages(
-            connection=self.connection,
-            url=self.links['branches']['href'],
-            resource=Branch,
-            parameters=parameters)
-
-        return pages
+        return _pages_from_link(self, 'branches', Branch, parameters, prefetch, parallel)
 
 
 class MixinCommitsFromLink(): # pylint: disable=too-few-public-methods
     """Mixin class used to add querying for commits associated with object"""
+    __slots__ = ()
 
-    def commits(self, parameters: dict=None) -> tool.Pages:
+    def commits(self, parameters: dict=None, prefetch: bool = True) -> tool.Pages:
         """Method for retrieving commits from the associated object
 
+        Args:
+            parameters (dict, optional): Parameters used to query. Defaults to None.
+            prefetch (bool, optional): Request the next page while the current one
+                is consumed. Defaults to True.
+
         Returns:
             tool.Pages: Iterator that returns commit objects
         """
-        pages = tool.Pages(
-            connection=self.connection,
-            url=self.links['commits']['href'],
-            parameters=parameters,
-            resource=Commit)
-
-        return pages
+        return _pages_from_link(self, 'commits', Commit, parameters, prefetch)
 
 
 class MixinSourceFromLink(): # pylint: disable=too-few-public-methods
     """Mixin class used to add querying for source associated with object"""
+    __slots__ = ()
 
-    def source(self, parameters: dict=None) -> tool.Pages:
+    def source(self, parameters: dict=None, prefetch: bool = True) -> tool.Pages:
         """Method for retrieving source from the associated object
 
+        Args:
+            parameters (dict, optional): Parameters used to query. Defaults to None.
+            prefetch (bool, optional): Request the next page while the current one
+                is consumed. Defaults to True.
+
         Returns:
             tool.Pages: Iterator that returns commit_file objects
         """
-        pages = tool.Pages(
-            connection=self.connection,
-            url=self.links['source']['href'],
-            parameters=parameters,
-            resource=CommitFile)
-
-        return pages
+        return _pages_from_link(self, 'source', CommitFile, parameters, prefetch)
 
 
 class MixinStatusFromLink(): # pylint: disable=too-few-public-methods
     """Mixin class used to query commit statuses for a commit.
         Returns all statuses (e.g. build results) for a specific commit.
     """
+    __slots__ = ()
 
-    def statuses(self, parameters: dict=None) -> tool.Pages:
+    def statuses(self, parameters: dict=None, prefetch: bool = True) -> tool.Pages:
         """Method for retrieving commit statuses for a commit.
 
+        Args:
+            parameters (dict, optional): Parameters used to query. Defaults to None.
+            prefetch (bool, optional): Request the next page while the current one
+                is consumed. Defaults to True.
+
         Returns:
             tool.Pages: Iterator that returns build objects
         """
-        pages = tool.Pages(
-            connection=self.connection,
-            url=self.links['statuses']['href'],
-            parameters=parameters,
-            resource=Build)
-
-        return pages
+        return _pages_from_link(self, 'statuses', Build, parameters, prefetch)
 
 
 class MixinPullrequestFromLink(): # pylint: disable=too-few-public-methods
     """Mixin to add the ability to query pullrequests associated with a resource"""
-    def pullrequests(self, parameters: dict=None) -> tool.Pages:
+    __slots__ = ()
+
+    def pullrequests(self, parameters: dict=None, prefetch: bool = True) -> tool.Pages:
         """Method for retrieving pullrequests from repository
 
+        Args:
+            parameters (dict, optional): Parameters used to query. Defaults to None.
+            prefetch (bool, optional): Request the next page while the current one
+                is consumed. Defaults to True.
+
         Returns:
             tool.Pages: Iterator that returns pullrequest objects
         """
-        pages = tool.Pages(
-            connection=self.connection,
-            url=self.links['pullrequests']['href'],
-            parameters=parameters,
-            resource=Tag)
-
-        return pages
+        return _pages_from_link(self, 'pullrequests', Pullrequest, parameters, prefetch)
 
 
 class MixinTagsFromLink(): # pylint: disable=too-few-public-methods
     """Mixin to add querying tags associated with a resource"""
-    def tags_from_link(self, parameters: dict=None) -> tool.Pages:
+    __slots__ = ()
+
+    def tags_from_link(
+            self, parameters: dict=None, prefetch: bool = True,
+            parallel: bool = True) -> tool.Pages:
         """Method for retrieving tags from repository
 
+        Args:
+            parameters (dict, optional): Parameters used to query. Defaults to None.
+            prefetch (bool, optional): Request the next page while the current one
+                is consumed. Defaults to True.
+            parallel (bool, optional): Request every remaining page at once
+                after the first. Defaults to True.
+
         Returns:
             tool.Pages: Iterator that returns tag objects
         """
-        pages = tool.Pages(
-            connection=self.connection,
-            url=self.links['tags']['href'],
-            parameters=parameters,
-            resource=Tag)
-
-        return pages
+        return _pages_from_link(self, 'tags', Tag, parameters, prefetch, parallel)
 
 
 class MixinDelete(): # pylint: disable=too-few-public-methods
     """Mixin class used to add delete functionality"""
+    __slots__ = ()
+
     def delete(self) -> requests.models.Response:
         """Method for deleting the resource represented by this object.
 
@@ -126,14 +207,16 @@ class MixinDelete(): # pylint: disable=too-few-public-methods
             requests.models.Response: response returned by Bitbucket when
                 delete is requested.
         """
-        url = self.links['self']['href']
-        response = self.connection.session.delete(url)
+        response = self.connection.session.delete(self._self_href)
         response.raise_for_status()
+        _fetch_object.cache_clear()
         return response
 
 
 class MixinDiffCommit(): # pylint: disable=too-few-public-methods
     """Mixin class used to add diff functionality"""
+    __slots__ = ()
+
     def diff(self, commit_hash: Union[str, "Branch", "Commit", "Repository", None] = None) -> str:
         """Produces a raw git-style diff.
 
@@ -150,43 +233,56 @@ class MixinDiffCommit(): # pylint: disable=too-few-public-methods
         Returns:
             str: the diff output returned by Bitbucket
         """
-        source_hash = None
-        if isinstance(self, Repository):
-            commit = next(self.commits())
-            source_hash = commit.hash
-        elif isinstance(self, Branch):
-            source_hash = self.target['hash']
-        elif isinstance(self, Commit):
-            source_hash = self.hash
-
-        ### Handle different types of input
-        destination_hash = None
-        if isinstance(commit_hash, str):
-            destination_hash = commit_hash
-        if isinstance(commit_hash, Repository):
-            commit = next(commit_hash.commits())
-            destination_hash = commit.hash
-        elif isinstance(commit_hash, Branch):
-            destination_hash = commit_hash.target['hash']
-        elif isinstance(commit_hash, Commit):
-            destination_hash = commit_hash.hash
-
-        spec = source_hash
-        if destination_hash:
-            spec = f"{source_hash}..{destination_hash}"
+        return ''.join(self.diff_stream(commit_hash))
 
-        url = '/'.join([
-            self.connection.url_base,
-            'diff',
-            spec])
+    def diff_stream(
+            self, commit_hash: Union[str, "Branch", "Commit", "Repository", None] = None,
+            chunk_size: int = 65536):
+        """Produces a raw git-style diff, as diff() does, a chunk at a time.
 
-        response = self.connection.session.get(url)
-        response.raise_for_status()
+        The response is streamed so a large diff is never held in memory in full;
+        prefer this, or diff_lines(), when processing the diff piece by piece.
+
+        Args:
+            commit_hash (Union[str, Branch, Commit, Repository, None): see diff().
+            chunk_size (int, optional): bytes read from the response at a time.
+                Defaults to 65536.
+
+        Yields:
+            str: consecutive pieces of the diff output returned by Bitbucket
+        """
+        url = self._diff_url('diff', commit_hash)
+
+        with self.connection.session.get(url, stream=True) as response:
+            response.raise_for_status()
+
+            if response.encoding is None:
+                response.encoding = 'utf-8'
+
+            yield from response.iter_content(chunk_size=chunk_size, decode_unicode=True)
+
+    def diff_lines(
+            self, commit_hash: Union[str, "Branch", "Commit", "Repository", None] = None):
+        """Produces a raw git-style diff, as diff() does, a line at a time.
+
+        Args:
+            commit_hash (Union[str, Branch, Commit, Repository, None): see diff().
 
-        return response.text
+        Yields:
+            str: each line of the diff without its trailing newline
+        """
+        pending = ''
+        for chunk in self.diff_stream(commit_hash):
+            lines = (pending + chunk).split('\n')
+            pending = lines.pop()
+            yield from lines
+
+        if pending:
+            yield pending
 
     def diffstat(
-            self, commit_hash: Union[str, "Branch", "Commit", "Repository", None] = None) -> str:
+            self, commit_hash: Union[str, "Branch", "Commit", "Repository", None] = None
+            ) -> tool.Pages:
         """Produces a record for every path modified, including
         information on the type of the change and the number of lines added and removed.
 
@@ -201,37 +297,9 @@ class MixinDiffCommit(): # pylint: disable=too-few-public-methods
                 commit.
 
         Returns:
-            str: the diff output returned by Bitbucket
+            tool.Pages: Iterator that returns Diffstat objects
         """
-        source_hash = None
-        if isinstance(self, Repository):
-            commit = next(self.commits())
-            source_hash = self.hash
-        elif isinstance(self, Branch):
-            source_hash = self.target['hash']
-        elif isinstance(self, Commit):
-            source_hash = self.hash
-
-        ### Handle different types of input
-        destination_hash = None
-        if isinstance(commit_hash, str):
-            destination_hash = commit_hash
-        if isinstance(commit_hash, Repository):
-            commit = next(commit_hash.commits())
-            destination_hash = commit.hash
-        elif isinstance(commit_hash, Branch):
-            destination_hash = commit_hash.target['hash']
-        elif isinstance(commit_hash, Commit):
-            destination_hash = commit_hash.hash
-
-        spec = source_hash
-        if destination_hash:
-            spec = f"{source_hash}..{destination_hash}"
-
-        url = '/'.join([
-            self.connection.url_base,
-            'diffstat',
-            spec])
+        url = self._diff_url('diffstat', commit_hash)
 
         pages = tool.Pages(
             connection=self.connection,
@@ -239,40 +307,157 @@ class MixinDiffCommit(): # pylint: disable=too-few-public-methods
             resource=Diffstat)
 
         return pages
-        # response = self.connection.session.get(url)
-        # response.raise_for_status()
 
-        # return response
+    def _diff_url(
+            self, endpoint: str,
+            commit_hash: Union[str, "Branch", "Commit", "Repository", None]) -> str:
+        """URL of a diff style endpoint for the revspec between this object and commit_hash
 
+        Args:
+            endpoint (str): 'diff' or 'diffstat'
+            commit_hash (Union[str, Branch, Commit, Repository, None): the other end
+                of the revspec, if any.
 
-class Base(SimpleNamespace):
-    """Base class for Bitbucket resources"""
-    def __init__(self, connection: tool.Connection, **kwargs) -> None:
-        super().__init__(**kwargs)
+        Returns:
+            str: URL of the endpoint for the revspec
+        """
+        spec = _commit_hash_of(self)
+        destination_hash = _commit_hash_of(commit_hash)
+
+        if destination_hash:
+            spec = f"{spec}..{destination_hash}"
+
+        return f"{self.connection.url_base}/{endpoint}/{spec}"
+
+
+def _cached_property(method):
+    """Like functools.cached_property for the slotted resource classes; the value
+    is computed once per resource and kept until the resource is refreshed.
+    """
+    name = method.__name__
 
+    @functools.wraps(method)
+    def getter(self):
+        if self._cache is None:
+            self._cache = {}
+
+        if name not in self._cache:
+            self._cache[name] = method(self)
+
+        return self._cache[name]
+
+    return property(getter)
+
+
+class _Field(): # pylint: disable=too-few-public-methods
+    """Descriptor reading a commonly used JSON field straight out of Base._data,
+    skipping the failed attribute lookup that precedes Base.__getattr__
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        try:
+            return obj._data[self.name] # pylint: disable=protected-access
+        except KeyError as error:
+            raise AttributeError(
+                f"'{objtype.__name__}' object has no attribute '{self.name}'") from error
+
+    def __set__(self, obj, value):
+        obj._data[self.name] = value # pylint: disable=protected-access
+
+
+class Base():
+    """Base class for Bitbucket resources
+
+    The JSON Bitbucket returns for a resource is kept in a single dictionary
+    and exposed as attributes, so instances carry no per-instance __dict__.
+    """
+    __slots__ = ('connection', '_data', '_cache', '_etag')
+    links = _Field('links')
+    type = _Field('type')
+
+    def __init__(self, connection: tool.Connection, **kwargs) -> None:
         self.connection = connection
+        self._data = kwargs
+        self._cache = None # values of _cached_property, created on first use
+        self._etag = None # ETag of the last refresh, sent back to skip unchanged bodies
+
+    def __getattr__(self, name):
+        if name in ('_data', '_cache', '_etag'):
+            raise AttributeError(name)
+
+        try:
+            return self._data[name]
+        except KeyError as error:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'") from error
+
+    def __setattr__(self, name, value):
+        try:
+            super().__setattr__(name, value)
+        except AttributeError:
+            self._data[name] = value
+
+    def __eq__(self, other):
+        if not isinstance(other, Base):
+            return NotImplemented
+
+        return (
+            type(self) is type(other)
+            and self.connection == other.connection
+            and self._data == other._data)
+
+    __hash__ = None
 
     def __repr__(self):
         return f'<{self.__class__.__name__} {self.name}>'
 
+    @_cached_property
+    def _self_href(self) -> str:
+        """URL of the resource itself"""
+        return self.links['self']['href']
+
     def refresh(self):
-        """Update a resource to capture changes that occurred after resource generation"""
-        url = self.links['self']['href']
+        """Update a resource to capture changes that occurred after resource generation
+
+        After the first refresh the request is conditional, so a resource that
+        has not changed costs an empty 304 response and no decoding.
+        """
+        headers = {'If-None-Match': self._etag} if self._etag else None
+
+        response = self.connection.session.get(self._self_href, headers=headers)
+        if response.status_code == 304:
+            return
 
-        response = self.connection.session.get(url)
         response.raise_for_status()
 
-        self.__dict__.update(**response.json())
+        self._data.update(tool.parse_json(response))
+        self._cache = None
+        self._etag = response.headers.get('ETag')
 
 
 class Branch(MixinCommitsFromLink, MixinDelete, MixinDiffCommit, Base):
     """Helper class for Branches"""
+    __slots__ = ()
+    name = _Field('name')
+    target = _Field('target')
 
 
 class Build(Base):
     """Helper class for Builds.
         Object is returned from a commit's status link.
     """
+    __slots__ = ()
+    key = _Field('key')
+    name = _Field('name')
+    state = _Field('state')
+    url = _Field('url')
 
     def commit_object(self, parameters: dict=None) -> "Commit":
         """Method for retrieving commit from the associated object
@@ -280,28 +465,69 @@ class Build(Base):
         Returns:
             commit: commit object associated with a build
         """
-        response = self.connection.session.get(
-            self.links['commit']['href'],
-            params=parameters)
+        url = self.links['commit']['href']
 
-        response.raise_for_status()
+        if parameters:
+            response = self.connection.session.get(url, params=parameters)
+            response.raise_for_status()
+            data = tool.parse_json(response)
+        else:
+            data = _fetch_commit(self.connection.session, url)
 
         commit = Commit(
             connection=self.connection,
-            **response.json())
+            **data)
 
         return commit
 
 
 class Commit(MixinDiffCommit, MixinStatusFromLink, Base):
     """Class representing a commit in Bitbucket"""
+    __slots__ = ()
+    hash = _Field('hash')
+    message = _Field('message')
+    author = _Field('author')
+    date = _Field('date')
+    parents = _Field('parents')
 
     def __repr__(self):
         return f'{self.__class__.__name__}(hash={self.hash})'
 
+    @classmethod
+    def bulk_fetch(
+            cls, connection: tool.Connection, urls, max_workers: int = 16) -> list:
+        """Retrieve several commits at once rather than one after the other,
+        e.g. the commits of every build reported for a revision.
+
+        Args:
+            connection (tool.Connection): connection whose session makes the requests
+            urls (Iterable[str]): commit URLs, such as links['commit']['href'] of a Build
+            max_workers (int, optional): How many requests may be in flight at once.
+                Defaults to 16.
+
+        Returns:
+            list: Commit objects in the order of urls
+
+        Example:
+            commits = Commit.bulk_fetch(
+                connection, (build.links['commit']['href'] for build in commit.statuses()))
+        """
+        fetch = functools.partial(_fetch_commit, connection.session)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            data = list(executor.map(fetch, urls))
+
+        return [cls(connection=connection, **commit) for commit in data]
+
 
 class Diffstat(Base):
     """Helper class for diffstat"""
+    __slots__ = ()
+    old = _Field('old')
+    new = _Field('new')
+    status = _Field('status')
+    lines_added = _Field('lines_added')
+    lines_removed = _Field('lines_removed')
 
     def __repr__(self):
         return f"{self.__class__.__name__} {self.old['path']}:{self.new['path']}"
@@ -309,6 +535,10 @@ class Diffstat(Base):
 
 class CommitFile(Base):
     """Helper class for commit_file"""
+    __slots__ = ()
+    path = _Field('path')
+    commit = _Field('commit')
+    size = _Field('size')
 
     def __repr__(self):
         return f'{self.__class__.__name__} {self.path}'
@@ -321,17 +551,17 @@ class CommitFile(Base):
             Commit: object representing the merging of two histories
         """
         url = self.commit['links']['self']['href']
-        response = self.connection.session.get(url)
 
         commit = Commit(
             connection=self.connection,
-            **response.json())
+            **_fetch_commit(self.connection.session, url))
 
         return commit
 
 
 class Pipeline(Base):
     """Helper class for Pipelines"""
+    __slots__ = ()
 
     def __repr__(self):
         representation = (
@@ -342,15 +572,22 @@ class Pipeline(Base):
 
 class Pullrequest(MixinCommitsFromLink, Base):
     """Helper class for Pullrequests"""
+    __slots__ = ()
 
     def __repr__(self):
         return f'<{self.__class__.__name__} {self.id}>'
 
     def merge(
-            self, merge_strategy: "PullrequestMergeStrategy",
+            self, merge_strategy: Union["PullrequestMergeStrategy", str],
             message: str) -> Union["Pullrequest", "PullrequestWaiter"]:
         """Merge an open pullrequest
 
+        Args:
+            merge_strategy (Union[PullrequestMergeStrategy, str]): how the commits are
+                added to the destination, either as the enum or Bitbucket's name
+                for the strategy (e.g. 'squash').
+            message (str): commit message for the merge
+
         Returns:
             Union["Pullrequest", "PullrequestWaiter"]: Either a pullrequest waiter if the merge
                 is occurring asynchronously on Bitbucket's side or a closed pullrequest.
@@ -362,11 +599,13 @@ class Pullrequest(MixinCommitsFromLink, Base):
             'message': message,
         }
 
-        if merge_strategy.value:
-            data['merge_strategy'] = merge_strategy.value
+        strategy = getattr(merge_strategy, 'value', merge_strategy)
+        if strategy:
+            data['merge_strategy'] = strategy
 
         response = self.connection.session.post(url, json=data)
         response.raise_for_status()
+        _fetch_object.cache_clear()
 
         return_value = None
         if response.headers.get('Location'):
@@ -374,11 +613,11 @@ class Pullrequest(MixinCommitsFromLink, Base):
         else:
             return_value = Pullrequest(
                 connection=self.connection,
-                **response.json())
+                **tool.parse_json(response))
 
         return return_value
 
-    @property
+    @_cached_property
     def merge_commit_object(self) -> Commit:
         """Commit object representing the merging of two histories done
         through a pullrequest.
@@ -387,70 +626,182 @@ class Pullrequest(MixinCommitsFromLink, Base):
             Commit: object representing the merging of two histories
         """
         url = self.merge_commit['links']['self']['href']
-        response = self.connection.session.get(url)
 
         commit = Commit(
             connection=self.connection,
-            **response.json())
+            **_fetch_commit(self.connection.session, url))
 
         return commit
 
 
 class PullrequestWaiter():
     """Class instantiated when a pullrequest is merged asynchronously"""
+    __slots__ = ('connection', 'location', 'last_response', 'last_polled')
+
     def __init__(self, connection: tool.Connection, location: str):
         self.connection = connection
         self.location = location
+        self.last_response = None # most recent poll, reused by response()
+        self.last_polled = 0.0 # time.monotonic() of the most recent poll
 
     def ready(self):
         """Determine if a pullrequest's merge request has completed"""
-        status = False
+        poll_merge = self._get()
+
+        if poll_merge.status_code == 400:
+            return True
 
-        poll_merge = self.connection.session.get(
-            self.location)
         poll_merge.raise_for_status()
 
-        if poll_merge.status_code == 400:
-            status = True
+        return self._task_status(poll_merge) == 'SUCCESS'
+
+    def response(self, max_age: float = 1.0):
+        """Get the status of a pullrequest
 
-        if poll_merge.json().get('task_status') == 'SUCCESS':
-            status = True
+        Args:
+            max_age (float, optional): How many seconds the response of the last poll
+                made by ready(), poll() or wait() is reused for instead of polling
+                again. Defaults to 1.0.
+        """
+        if self.last_response is None or time.monotonic() - self.last_polled > max_age:
+            return self._get()
 
-        return status
+        return self.last_response
 
-    def response(self):
-        """Get the status of a pullrequest"""
-        poll_merge = self.connection.session.get(
-            self.location)
+    def _get(self) -> requests.models.Response:
+        """Poll the merge task, remembering the response for response()"""
+        self.last_response = self.connection.session.get(self.location)
+        self.last_polled = time.monotonic()
 
-        return poll_merge
+        return self.last_response
 
-    def wait(self, delay: int = 5, max_attempts: int = 40):
-        """Wait for a asynchronous pullrequest to complete
+    @staticmethod
+    def _task_status(poll_merge: requests.models.Response) -> Union[str, None]:
+        """The task_status reported in a poll response, decoding the body once"""
+        if not poll_merge.content:
+            return None
+
+        return tool.parse_json(poll_merge).get('task_status')
+
+    def poll(self, delay: float = 0.25, max_attempts: int = 40, max_delay: float = 5):
+        """Poll a asynchronous pullrequest merge until it completes
+
+        Polling backs off exponentially, with jitter, between attempts unless
+        Bitbucket asks for a specific interval through a Retry-After header.
+        Control returns to the caller after every poll that finds the merge
+        still running, so other work can be done between polls.
 
         Args:
-            delay (int, optional): How long to wait between polling. Defaults to 5.
+            delay (float, optional): How long to wait before the first poll; most
+                merges finish within a second so polling starts early.
+                Defaults to 0.25.
             max_attempts (int, optional): How many poll attempts to make. Defaults to 40.
-        """
-        for attempt in range(0, max_attempts): #pylint: disable=unused-variable
-            time.sleep(delay)
+            max_delay (float, optional): Longest wait between two polls. Defaults to 5.
 
-            poll_merge = self.connection.session.get(self.location)
+        Yields:
+            requests.models.Response: each poll that found the merge still running
 
-            if poll_merge.json().get('task_status') == 'PENDING':
-                continue
+        Raises:
+            TimeoutError: the merge had not completed after max_attempts polls.
+        """
+        sleep = delay
+        for attempt in range(1, max_attempts + 1):
+            time.sleep(sleep)
+
+            poll_merge = self._get()
 
             if poll_merge.status_code == 400:
-                break
+                return
+
+            if self._task_status(poll_merge) == 'SUCCESS':
+                return
 
-            if poll_merge.json().get('task_status') == 'SUCCESS':
-                break
+            yield poll_merge
+
+            retry_after = poll_merge.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                sleep = int(retry_after)
+            else:
+                sleep = min(delay * 2 ** attempt * (1 + random.uniform(0, 0.5)), max_delay)
+
+        raise TimeoutError(
+            f"Merge at {self.location} did not complete after {max_attempts} attempts")
+
+    def wait(self, delay: float = 0.25, max_attempts: int = 40, max_delay: float = 5):
+        """Wait for a asynchronous pullrequest to complete
+
+        Args:
+            delay (float, optional): How long to wait before the first poll; most
+                merges finish within a second so polling starts early.
+                Defaults to 0.25.
+            max_attempts (int, optional): How many poll attempts to make. Defaults to 40.
+            max_delay (float, optional): Longest wait between two polls. Defaults to 5.
+
+        Raises:
+            TimeoutError: the merge had not completed after max_attempts polls.
+        """
+        for _ in self.poll(delay, max_attempts, max_delay):
+            pass
 
 
 class Repository(
         MixinBranchesFromLink, MixinCommitsFromLink, MixinDiffCommit,
         MixinPullrequestFromLink, MixinSourceFromLink, MixinTagsFromLink, Base):
     """Helper class for Repositories"""
+    __slots__ = ('_tip',)
+    tip_ttl = 30 # seconds a looked up latest commit is reused for
+
+    @property
+    def tip_hash(self) -> str:
+        """Hash of the repository's latest commit.
+
+        The lookup is reused for tip_ttl seconds so that consecutive diffs
+        against the repository do not each list its commits again.
+
+        Returns:
+            str: hash of the latest commit
+        """
+        now = time.monotonic()
+        tip = getattr(self, '_tip', None)
+
+        if tip is None or tip[1] <= now:
+            ### a single-commit page is all that is needed for the latest hash
+            latest = next(self.commits({'pagelen': 1}, prefetch=False))
+            tip = self._tip = (latest.hash, now + self.tip_ttl)
+
+        return tip[0]
+
+    def gather(self, *names: str, max_workers: int = 8) -> tuple:
+        """Request the first page of several linked collections in parallel
+        rather than one after the other.
+
+        Args:
+            *names (str): Collections to load; any of 'branches', 'commits',
+                'pullrequests', 'source' or 'tags'.
+            max_workers (int, optional): How many requests may be in flight at once.
+                Defaults to 8.
+
+        Returns:
+            tuple: tool.Pages iterators, in the order of names, with their
+                first page already loaded.
+
+        Example:
+            branches, tags = repository.gather('branches', 'tags')
+        """
+        collections = {
+            'branches': self.branches,
+            'commits': self.commits,
+            'pullrequests': self.pullrequests,
+            'source': self.source,
+            'tags': self.tags_from_link,
+        }
+
+        pages = tuple(collections[name]() for name in names)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(tool.Pages.get_page, pages))
+
+        return pages
 
     def pullrequest(self, pullrequest_id: int) -> "Pullrequest":
         """Method for retrieving a existing pullrequest from Bitbucket
@@ -461,20 +812,11 @@ class Repository(
         Returns:
             Pullrequest: object representing a pullrequest
         """
-        url = '/'.join([
-            self.links['pullrequests']['href'],
-            str(pullrequest_id)])
-
-        response = self.connection.session.get(url)
-
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as error:
-            raise exceptions.ObjectDoesNotExist(*error.args, **error.__dict__) from error
+        url = f"{self.links['pullrequests']['href']}/{pullrequest_id}"
 
         pullrequest = Pullrequest(
             connection=self.connection,
-            **response.json())
+            **_fetch_object(self.connection.session, url))
 
         return pullrequest
 
@@ -488,24 +830,17 @@ class Repository(
             Branch: a single branch object matching the parameter
                 branch_name found within the repository.
         """
-        url = '/'.join([
-            self.links['branches']['href'],
-            branch_name])
-
-        response = self.connection.session.get(url)
-
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as error:
-            raise exceptions.ObjectDoesNotExist(*error.args, **error.__dict__) from error
+        url = f"{self.links['branches']['href']}/{branch_name}"
 
         branch = Branch(
             connection=self.connection,
-            **response.json())
+            **_fetch_object(self.connection.session, url))
 
         return branch
 
-    def create_pullrequest(self, pullrequest_data: "PullrequestData") -> "Pullrequest":
+    def create_pullrequest(
+            self, pullrequest_data: "PullrequestData"
+            ) -> Union["Pullrequest", "PullrequestWaiter"]:
         """Method for creating a pullrequest in Bitbucket
 
         Args:
@@ -513,22 +848,31 @@ class Repository(
                 required to create a pullrequest.
 
         Returns:
-            Pullrequest: object representing a pullrequest
+            Union["Pullrequest", "PullrequestWaiter"]: object representing a pullrequest or,
+                when Bitbucket accepts the request to process it asynchronously,
+                a waiter for its completion.
         """
         url = self.links['pullrequests']['href']
 
-        data = pullrequest_data.generate_pullrequest_dictionary()
-
-        response = self.connection.session.post(url, json=data)
+        response = self.connection.session.post(
+            url,
+            data=pullrequest_data.as_bytes(),
+            headers={'Content-Type': 'application/json'})
         response.raise_for_status()
 
+        ### A 201 also carries a Location, pointing at the created pullrequest
+        if response.status_code == 202 and response.headers.get('Location'):
+            return PullrequestWaiter(self.connection, response.headers.get('Location'))
+
         pullrequest = Pullrequest(
             connection=self.connection,
-            **response.json())
+            **tool.parse_json(response))
 
         return pullrequest
 
-    def create_tag(self, tag_name: str, commit_hash: Union[str, "Commit"]) -> "Tag":
+    def create_tag(
+            self, tag_name: str,
+            commit_hash: Union[str, "Branch", "Commit", "Repository"]) -> "Tag":
         """Method for creating a tag in a Bitbucket repository
 
         Raises:
@@ -537,71 +881,65 @@ class Repository(
         Returns:
             Tag: object representing a Tag in Bitbucket
         """
-        url = self.links['tags']['href']
+        return self._create_named('tags', Tag, tag_name, commit_hash)
 
-        data = {'name': tag_name}
-
-        if isinstance(commit_hash, str):
-            data['target'] = {'hash': commit_hash}
-        elif isinstance(commit_hash, Commit):
-            data['target'] = {'hash': commit_hash.hash}
-
-        response = self.connection.session.post(url, json=data)
-
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as error:
-            if 'application/json' in response.headers['Content-Type']:
-                if 'already exists' in response.json().get('error', {}).get('message'): # pylint: disable=no-else-raise
-                    raise exceptions.ObjectExists(*error.args, **error.__dict__) from error
-                else:
-                    raise
-            else:
-                raise
-
-        tag = Tag(
-            connection=self.connection,
-            **response.json())
-
-        return tag
-
-    def create_branch(self, branch_name: str, commit_hash: Union[str, "Commit"]) -> Branch:
+    def create_branch(
+            self, branch_name: str,
+            commit_hash: Union[str, "Branch", "Commit", "Repository"]) -> Branch:
         """Method for creating a git branch in the associated repository
 
         Args:
             branch_name (str): The name of the branch
-            commit_hash (str, optional): short or long commit hash. Defaults to "default".
+            commit_hash (Union[str, Branch, Commit, Repository]): short or long commit hash,
+                or the object whose commit the branch should start from.
+
+        Raises:
+            exceptions.ObjectExists: exception thrown when the branch already exists.
 
         Returns:
             Branch: branch object representing a newly created git branch in the repository.
         """
-        url = self.links['branches']['href']
+        return self._create_named('branches', Branch, branch_name, commit_hash)
+
+    def _create_named(
+            self, link: str, resource, name: str,
+            commit_hash: Union[str, "Branch", "Commit", "Repository"]):
+        """Create a branch or tag pointing at commit_hash
+
+        Args:
+            link (str): 'branches' or 'tags', the collection to post to
+            resource: Branch or Tag, the class returned
+            name (str): name of the new ref
+            commit_hash (Union[str, Branch, Commit, Repository]): commit the ref points at
+
+        Raises:
+            exceptions.ObjectExists: a ref with the same name already exists.
+        """
+        url = self.links[link]['href']
 
-        data = {'name': branch_name}
+        data = {'name': name}
 
-        if isinstance(commit_hash, str):
-            data['target'] = {'hash': commit_hash}
-        elif isinstance(commit_hash, Commit):
-            data['target'] = {'hash': commit_hash.hash}
+        target_hash = _commit_hash_of(commit_hash)
+        if target_hash:
+            data['target'] = {'hash': target_hash}
 
         response = self.connection.session.post(url, json=data)
 
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as error:
-            if 'application/json' in response.headers['Content-Type']:
-                if 'already exists' in response.json().get('error', {}).get('message'): # pylint: disable=no-else-raise
-                    raise exceptions.ObjectExists(*error.args, **error.__dict__) from error
-                else:
-                    raise
-            else:
-                raise
+            if _already_exists(response):
+                raise exceptions.ObjectExists(
+                    *error.args, response=error.response, request=error.request) from error
+            raise
 
-        branch = Branch(
+        _fetch_object.cache_clear()
+
+        ref = resource(
             connection=self.connection,
-            **response.json())
+            **tool.parse_json(response))
 
-        return branch
+        return ref
 
     def tag(self, tag_name: str) -> "Tag":
         """Method for retrieving a single tag object
@@ -613,26 +951,19 @@ class Repository(
             Tag: a single branch object matching the parameter
                 tag_name found within the repository.
         """
-        url = '/'.join([
-            self.links['tags']['href'],
-            tag_name])
-
-        response = self.connection.session.get(url)
-
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as error:
-            raise exceptions.ObjectDoesNotExist(*error.args, **error.__dict__) from error
+        url = f"{self.links['tags']['href']}/{tag_name}"
 
         tag = Tag(
             connection=self.connection,
-            **response.json())
+            **_fetch_object(self.connection.session, url))
 
         return tag
 
 
 class PullrequestData(): # pylint: disable=too-few-public-methods
     """Class used to represent and generate the data required to make a pullrequest"""
+    __slots__ = ('title', 'source_branch', 'destination_branch', 'close_source_branch')
+
     def __init__(
             self, title: str, source_branch: str,
             destination_branch: str, close_source_branch: bool = False):
@@ -657,16 +988,13 @@ class PullrequestData(): # pylint: disable=too-few-public-methods
         Returns:
             dict: dictionary of data to make a pullrequest
         """
-        data = {}
-        if self.title:
-            data['title'] = self.title
-        else:
-            data['title'] = self.source_branch
-
-        data['source'] = {
-            "branch": {
-                "name": self.source_branch
-            }
+        data = {
+            'title': self.title or self.source_branch,
+            'source': {
+                "branch": {
+                    "name": self.source_branch
+                }
+            },
         }
 
         if self.destination_branch:
@@ -681,6 +1009,14 @@ class PullrequestData(): # pylint: disable=too-few-public-methods
 
         return data
 
+    def as_bytes(self) -> bytes:
+        """The dictionary from generate_pullrequest_dictionary() encoded as a JSON request body
+
+        Returns:
+            bytes: JSON to post with a Content-Type of application/json
+        """
+        return tool.dump_json(self.generate_pullrequest_dictionary())
+
 
 class PullrequestState(Enum):
     """
@@ -724,8 +1060,11 @@ class PullrequestMergeStrategy(Enum):
 
 class Tag(MixinCommitsFromLink, MixinDelete, Base):
     """Helper class for Tags"""
+    __slots__ = ()
+    name = _Field('name')
+    target = _Field('target')
 
-    @property
+    @_cached_property
     def target_commit_object(self) -> Commit:
         """Commit object representing the tag
 
@@ -733,10 +1072,18 @@ class Tag(MixinCommitsFromLink, MixinDelete, Base):
             Commit: object representing the tag
         """
         url = self.target['links']['self']['href']
-        response = self.connection.session.get(url)
 
         commit = Commit(
             connection=self.connection,
-            **response.json())
+            **_fetch_commit(self.connection.session, url))
 
         return commit
+
+
+### How _commit_hash_of finds the commit hash of each supported type
+_HASH_GETTERS = {
+    str: lambda obj: obj,
+    Repository: lambda obj: obj.tip_hash,
+    Branch: lambda obj: obj.target['hash'],
+    Commit: lambda obj: obj.hash,
+}
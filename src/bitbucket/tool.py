@@ -1,20 +1,289 @@
 """Generate an iterator for "paging" through list calls"""
-from typing import NamedTuple
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import json
 import logging
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
 
+### Fastest JSON decoder available, falling back to requests' own decoding
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    try:
+        from ujson import loads as json_loads
+    except ImportError:
+        json_loads = None
 
-class Connection(NamedTuple):
-    """Holds a requests session and the base url for our API"""
-    session: requests.sessions.Session
-    url_base: str
+try:
+    from orjson import dumps as orjson_dumps
+except ImportError:
+    orjson_dumps = None
+
+
+### Shared by every Pages object to request the following page in the background
+PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+
+def parse_json(response: requests.models.Response):
+    """Decode the JSON body of a response, with orjson or ujson when installed
+
+    Args:
+        response (requests.models.Response): response returned by Bitbucket
+
+    Returns:
+        The decoded body, plain dicts and lists either way.
+    """
+    if json_loads is None:
+        return response.json()
+
+    return json_loads(response.content)
+
+
+def check_response(response: requests.models.Response, error_class: type = None):
+    """Raise for a 4xx or 5xx response, returning straight away otherwise
+
+    Args:
+        response (requests.models.Response): response returned by Bitbucket
+        error_class (type, optional): requests.exceptions.HTTPError subclass to raise
+            instead of HTTPError itself, e.g. exceptions.ObjectDoesNotExist.
+
+    Raises:
+        requests.exceptions.HTTPError: the response reported an error.
+    """
+    if response.status_code < 400:
+        return
+
+    if error_class is None:
+        response.raise_for_status()
+
+    try:
+        response.raise_for_status()
+    except requests.exceptions.HTTPError as error:
+        raise error_class(
+            *error.args, response=error.response, request=error.request) from error
+
+
+def dump_json(data) -> bytes:
+    """Encode data as a compact JSON request body, with orjson when installed
+
+    Args:
+        data: plain dicts, lists, strings and numbers
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson_dumps is None:
+        return json.dumps(data, separators=(',', ':')).encode()
+
+    return orjson_dumps(data)
+
+
+def ttl_lru_cache(maxsize: int = 512, ttl: float = 60):
+    """functools.lru_cache whose entries are reused for at most ttl seconds
+
+    Entries are keyed on the arguments plus the current ttl-long time bucket,
+    so a new bucket starts with a miss and stale entries age out of the LRU.
+
+    Args:
+        maxsize (int, optional): Most entries to keep. Defaults to 512.
+        ttl (float, optional): Seconds an entry is reused for. Defaults to 60.
+    """
+    def decorator(function):
+        @functools.lru_cache(maxsize=maxsize)
+        def cached(bucket, *args, **kwargs): # pylint: disable=unused-argument
+            return function(*args, **kwargs)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            return cached(int(time.monotonic() // ttl), *args, **kwargs)
+
+        wrapper.cache_clear = cached.cache_clear
+        wrapper.cache_info = cached.cache_info
+
+        return wrapper
+
+    return decorator
+
+
+class RateLimiter():
+    """Thread-safe token bucket allowing rate requests per second on average,
+    with bursts of up to burst requests
+    """
+    def __init__(self, rate: float, burst: int = None):
+        """
+        Args:
+            rate (float): Requests per second to allow.
+            burst (int, optional): Most requests let through at once. Defaults to rate.
+        """
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping until one is available"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            ### A negative balance is the time this caller owes the bucket
+            wait = -self.tokens / self.rate
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter taking a token from a RateLimiter before every request it sends,
+    retries included
+    """
+    def __init__(self, rate_limiter: RateLimiter, *args, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs):  # pylint: disable=arguments-differ
+        self.rate_limiter.acquire()
+        return super().send(request, *args, **kwargs)
+
+
+def create_session(
+        pool_connections: int = 32, pool_maxsize: int = 64,
+        max_retries: Retry = None, rate_limit: float = None) -> requests.sessions.Session:
+    """Create a session that keeps a pool of connections to Bitbucket alive
+    and retries throttled or failed requests.
+
+    Args:
+        pool_connections (int, optional): How many hosts to keep a pool for. Defaults to 32.
+        pool_maxsize (int, optional): How many connections to keep per host. Defaults to 64.
+        max_retries (Retry, optional): Retry policy for the session.
+            Defaults to backing off on 429 and 5xx responses.
+        rate_limit (float, optional): Most requests per second to send.
+            Defaults to no limit.
+
+    Returns:
+        requests.sessions.Session: session to share between every Connection
+    """
+    if max_retries is None:
+        max_retries = Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False)
+
+    session = requests.Session()
+    session.headers.update({
+        'Accept': 'application/json',
+        ### advertises br as well when a brotli decoder is installed
+        'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding'],
+    })
+
+    adapter_kwargs = {
+        'pool_connections': pool_connections,
+        'pool_maxsize': pool_maxsize,
+        'max_retries': max_retries,
+    }
+    if rate_limit:
+        adapter = RateLimitedAdapter(RateLimiter(rate_limit), **adapter_kwargs)
+    else:
+        adapter = HTTPAdapter(**adapter_kwargs)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
+
+
+_DEFAULT_SESSION = None
+_DEFAULT_SESSION_LOCK = threading.Lock()
+
+
+def default_session() -> requests.sessions.Session:
+    """Pooled session shared by every Connection created without one, made on first use
+
+    Returns:
+        requests.sessions.Session: the same session from create_session() on every call
+    """
+    global _DEFAULT_SESSION # pylint: disable=global-statement
+
+    with _DEFAULT_SESSION_LOCK:
+        if _DEFAULT_SESSION is None:
+            _DEFAULT_SESSION = create_session()
+
+    return _DEFAULT_SESSION
+
+
+class Connection():
+    """Holds a requests session and the base url for our API
+
+    The session is shared with the threads that prefetch or fetch pages in
+    parallel; issuing requests on one session from several threads is safe
+    and lets them draw from a single connection pool. Pass the same session
+    to every Connection rather than creating one per thread or per call, and
+    configure headers, auth or adapters before handing it out.
+    """
+    __slots__ = ('session', 'url_base')
+
+    def __init__(self, session: requests.sessions.Session = None, url_base: str = None):
+        """
+        Args:
+            session (requests.sessions.Session, optional): Session used for every request.
+                Defaults to the pooled session shared through default_session().
+            url_base (str, optional): URL of the resource requests are relative to.
+        """
+        if session is None:
+            session = default_session()
+
+        self.session = session
+        self.url_base = url_base
+
+    @classmethod
+    def create(
+            cls, url_base: str, pool_size: int = 32, rate_limit: float = None) -> "Connection":
+        """Connection with a new pooled session sized for pool_size concurrent requests
+
+        Args:
+            url_base (str): URL of the resource requests are relative to.
+            pool_size (int, optional): How many connections to keep open per host.
+                Defaults to 32.
+            rate_limit (float, optional): Most requests per second to send,
+                shared by every thread using the connection. Defaults to no limit.
+
+        Returns:
+            Connection: connection owning its own session
+        """
+        session = create_session(
+            pool_connections=pool_size, pool_maxsize=pool_size, rate_limit=rate_limit)
+
+        return cls(session=session, url_base=url_base)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(url_base={self.url_base!r})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        ### the default session outlives any one Connection
+        if self.session is not _DEFAULT_SESSION:
+            self.session.close()
 
 
 class Pages():
     """Class for paging over data"""
     logger = logging.getLogger(__name__)
+    pagelen = 100 # per page unless parameters set one; the most Bitbucket allows
 
-    def __init__(self, connection: Connection, url: str, resource, parameters: dict=None):
+    def __init__(
+            self, connection: Connection, url: str, resource, parameters: dict=None,
+            prefetch: bool = True, parallel: bool = False, max_concurrency: int = 5):
         """Create an iterator for URLs that hand back multiple resources that span
         multiple requests
 
@@ -24,59 +293,180 @@ class Pages():
                 API then tells us what the next page should be.
             resource (octopus.resource.*): The Class we'll use to generate objects.
             parameters (dict): dictionary of data to be used as URL parameters when
-                making a get request.
+                making a get request. A 'pagelen' of Pages.pagelen is added unless given.
+            prefetch (bool, optional): Request the next page in the background while
+                the current page is consumed. Defaults to True.
+            parallel (bool, optional): Once the first page reports the total size,
+                request every remaining page at once. Defaults to False.
+            max_concurrency (int, optional): How many pages parallel mode requests at
+                the same time. Defaults to 5.
         """
         self.connection = connection
+        self.url = url
         self.url_next = url
         self.api_class = resource
-        self.parameters = parameters
-        self.index = -1
+        self.parameters = {'pagelen': self.pagelen, **(parameters or {})}
+        self._params = self.parameters # sent with url_next; None once Bitbucket links the pages
         self.json = None
+        self._page_iter = iter(()) # resources of the current page not yet returned
         self.visited = 0 # keep track of how many resources we've returned
+        self.prefetch = prefetch
+        self.response_next = None # future for the page following the current one
+        self.parallel = parallel
+        self.max_concurrency = max_concurrency
+        self.responses_pending = None # futures for the remaining pages in parallel mode
 
     def __iter__(self):
         return self
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     def __next__(self):
         while True:
-            self.index += 1
-
-            try:
-                json_resource = self.json['values'][self.index]
-            except (IndexError, TypeError) as error:
-                if self.url_next:
-                    self.get_page()
-                else:
-                    raise StopIteration from error
-            else:
-                api_resource = self.api_class(
-                    connection=self.connection,
-                    **json_resource)
+            api_resource = self.take()
+            if api_resource is not None:
+                return api_resource
+
+            if not self.url_next:
+                ### Do not keep the last page alive once iteration is over
+                self.json = None
+                raise StopIteration
 
+            self.get_page()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """Same as __next__ for use with "async for"; pages are requested in a
+        worker thread so the event loop keeps running while they load.
+        """
+        loop = asyncio.get_event_loop()
+
+        while True:
+            api_resource = self.take()
+            if api_resource is not None:
                 return api_resource
 
+            if not self.url_next:
+                self.json = None
+                raise StopAsyncIteration
+
+            await loop.run_in_executor(None, self.get_page)
+
+    def close(self):
+        """Stop paging early, cancelling page requests that have not started yet
+        and dropping the current page
+        """
+        if self.response_next:
+            self.response_next.cancel()
+            self.response_next = None
+
+        for future in self.responses_pending or ():
+            future.cancel()
+        self.responses_pending = None
+
+        self.url_next = None
+        self.json = None
+        self._page_iter = iter(())
+
+    def take(self):
+        """Build the next resource of the current page
+
+        Returns:
+            The resource, or None once the current page is used up.
+        """
+        json_resource = next(self._page_iter, None)
+        if json_resource is None:
+            return None
+
+        api_resource = self.api_class(
+            connection=self.connection,
+            **json_resource)
+
+        return api_resource
+
     def get_page(self):
         """collect the next page of data from a paged resource"""
-        self.logger.debug("url_next=%s with parameters=%s", self.url_next, self.parameters)
+        ### Drop the consumed page so only one decoded page is held at a time
+        self.json = None
+
+        if self.responses_pending:
+            response = self.responses_pending.popleft().result()
+        elif self.response_next:
+            response = self.response_next.result()
+            self.response_next = None
+        else:
+            self.logger.debug("url_next=%s with parameters=%s", self.url_next, self._params)
+            response = self.connection.session.get(self.url_next, params=self._params)
 
-        response = self.connection.session.get(self.url_next, params=self.parameters)
         response.raise_for_status()
 
-        self.json = response.json()
-        self.visited = self.visited + self.json['pagelen']
+        json = self.json = parse_json(response)
+        ### count what the page holds; pagelen over-counts a short last page
+        values = json['values']
+        self.visited += len(values)
+        self._page_iter = iter(values)
+
+        if self.responses_pending is not None:
+            ### every page was already requested by get_pages_parallel
+            if not self.responses_pending:
+                self.url_next = None
+            return
+
+        if self.parallel and self.get_pages_parallel():
+            return
 
-        if self.json.get('next'):
+        url_next = json.get('next')
+        if url_next:
             ### Let Bitbucket decide our URL parameters
             ### after the initial request
-            self.parameters = None
-            self.url_next = self.json.get('next')
-        elif self.visited < self.json.get('size', 0):
+            self._params = None
+            self.url_next = url_next
+        elif self.visited < json.get('size', 0):
             ### pipelines end-point never returns a "next"
-            # if self.parameters and self.parameters.get('page'):
-            self.parameters['page'] = self.json.get('page', 1) + 1
-            # else:
-            # self.url_next = None
+            self._params = {**self.parameters, 'page': json.get('page', 1) + 1}
         else:
             self.url_next = None
 
-        self.index = -1
+        if self.url_next and self.prefetch:
+            ### Overlap fetching the next page with the caller consuming this one
+            self.logger.debug(
+                "prefetching url_next=%s with parameters=%s", self.url_next, self._params)
+            self.response_next = PREFETCH_EXECUTOR.submit(
+                self.connection.session.get, self.url_next, params=self._params)
+
+    def get_pages_parallel(self) -> bool:
+        """Request every page after the first at once when the first page
+        reports how many resources there are in total.
+
+        Returns:
+            bool: True if the remaining pages were requested
+        """
+        size = self.json.get('size')
+        pagelen = self.json.get('pagelen')
+
+        if not size or not pagelen or self.json.get('page', 1) != 1:
+            return False
+
+        pages_total = -(-size // pagelen)
+        if pages_total < 2:
+            return False
+
+        self.logger.debug("requesting pages 2-%s of url=%s in parallel", pages_total, self.url)
+
+        get = self.connection.session.get
+        parameters = self.parameters
+
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        self.responses_pending = deque(
+            executor.submit(get, self.url, params={**parameters, 'page': page})
+            for page in range(2, pages_total + 1))
+        ### lets the worker threads exit once the submitted requests are done
+        executor.shutdown(wait=False)
+
+        return True
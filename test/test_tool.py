@@ -1,12 +1,24 @@
 """Test suite for the bitbucket.tool module"""
+import asyncio
+import json
 import random
 import string
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+
+import requests
 
 import src.bitbucket
 
 
+def mock_response(payload: dict, status_code: int = 200) -> Mock:
+    """Mock of a requests response whose body is payload"""
+    response = Mock(status_code=status_code, content=json.dumps(payload).encode())
+    response.json.return_value = payload
+
+    return response
+
+
 class Page(unittest.TestCase):
     """Test cases for the bitbucket.tool.Pages class"""
 
@@ -18,18 +30,16 @@ class Page(unittest.TestCase):
             session=session,
             url_base='https://api.bitbucket.org/2.0/repositories/test_workspace/test_repository')
 
-        response_1 = Mock(status_code=200)
-        response_1.json.return_value = {
+        response_1 = mock_response({
             'next': f'{connection.url_base}/refs/branches?page=2',
             'page': 1,
             'pagelen': 10,
             'size': 29,
             'values': [
                 {'name': f'{x}{"".join(random.choices(string.ascii_lowercase + string.digits, k=4))}'} # pylint: disable=line-too-long
-                for x in range(1,11)]}
+                for x in range(1,11)]})
 
-        response_2 = Mock(status_code=200)
-        response_2.json.return_value = {
+        response_2 = mock_response({
             'next': f'{connection.url_base}/refs/branches?page=3',
             'page': 2,
             'pagelen': 10,
@@ -37,17 +47,16 @@ class Page(unittest.TestCase):
             'size': 29,
             'values': [
                 {'name': f'{x}{"".join(random.choices(string.ascii_lowercase + string.digits, k=4))}'} # pylint: disable=line-too-long
-                for x in range(11,21)]}
+                for x in range(11,21)]})
 
-        response_3 = Mock(status_code=200)
-        response_3.json.return_value = {
+        response_3 = mock_response({
             'page': 3,
             'pagelen': 9,
             'previous': f'{connection.url_base}/refs/branches?page=2',
             'size': 29,
             'values': [
                 {'name': f'{x}{"".join(random.choices(string.ascii_lowercase + string.digits, k=4))}'} # pylint: disable=line-too-long
-                for x in range(21,30)]}
+                for x in range(21,30)]})
 
 
         session.get.side_effect = [
@@ -67,6 +76,7 @@ class Page(unittest.TestCase):
         # Assert
         self.assertEqual(session.get.call_count, 3)
         self.assertEqual(len(resources), 29)
+        self.assertEqual(session.get.call_args_list[0][1]['params'], {'pagelen': 100})
 
     def test_get_page_single_resource(self):
         """When a single resource exists for query (size of 1)
@@ -81,9 +91,7 @@ class Page(unittest.TestCase):
             session=session,
             url_base='https://api.bitbucket.org/2.0/repositories/test_workspace/test_repository')
 
-        response_1 = Mock()
-        response_1.status_code = 200
-        response_1.json.return_value = {
+        response_1 = mock_response({
             'pagelen': 10,
             'values': [
                 {
@@ -97,7 +105,7 @@ class Page(unittest.TestCase):
                     'created_on': '2021-12-28T12:14:51.294037+00:00',
                     'commit': {},}],
             'page': 1,
-            'size': 1}
+            'size': 1})
 
         session.get.side_effect = [
             response_1,
@@ -125,9 +133,7 @@ class Page(unittest.TestCase):
             session=session,
             url_base='https://api.bitbucket.org/2.0/repositories/test_workspace/test_repository')
 
-        response_1 = Mock()
-        response_1.status_code = 200
-        response_1.json.return_value = {
+        response_1 = mock_response({
             'page': 1,
             'pagelen': 10,
             'size': 20,
@@ -140,10 +146,9 @@ class Page(unittest.TestCase):
                 {'build_number': 63758},
                 {'build_number': 63756},
                 {'build_number': 63755},
-                {'build_number': 63750}]}
+                {'build_number': 63750}]})
 
-        response_2 = Mock()
-        response_2.json.return_value = {'page': 2,
+        response_2 = mock_response({'page': 2,
             'pagelen': 10,
             'size': 20,
             'values': [
@@ -156,7 +161,7 @@ class Page(unittest.TestCase):
                 {'build_number': 63707},
                 {'build_number': 63577},
                 {'build_number': 63576},
-                {'build_number': 63575}]}
+                {'build_number': 63575}]})
 
         session.get.side_effect = [
             response_1,
@@ -176,3 +181,268 @@ class Page(unittest.TestCase):
         # Assert
         self.assertEqual(session.get.call_count, 2)
         self.assertEqual(len(resources), 20)
+        self.assertEqual(session.get.call_args_list[1][1]['params']['page'], 2)
+        self.assertNotIn('page', pages.parameters)
+
+    def test_get_page_short_page_counts_values(self):
+        """Pages count the resources a page holds rather than its advertised pagelen"""
+        # Arrange
+        session = Mock()
+        connection = src.bitbucket.tool.Connection(
+            session=session,
+            url_base='https://api.bitbucket.org/2.0/repositories/test_workspace/test_repository')
+
+        session.get.side_effect = [
+            mock_response({
+                'page': 1,
+                'pagelen': 10,
+                'size': 3,
+                'values': [{'build_number': 3}, {'build_number': 2}]}),
+            mock_response({
+                'page': 2,
+                'pagelen': 10,
+                'size': 3,
+                'values': [{'build_number': 1}]})]
+
+        pages = src.bitbucket.tool.Pages(
+            connection=connection,
+            url=f'{connection.url_base}/pipelines/',
+            parameters={'sort': '-created_on'},
+            resource=src.bitbucket.resource.Pipeline,
+            prefetch=False)
+
+        # Act
+        resources = list(pages)
+
+        # Assert
+        self.assertEqual(session.get.call_count, 2)
+        self.assertEqual(len(resources), 3)
+        self.assertEqual(pages.visited, 3)
+
+    def test_get_page_prefetches_next_page(self):
+        """While the first page is consumed the next page is already requested"""
+        # Arrange
+        session = Mock()
+        connection = src.bitbucket.tool.Connection(
+            session=session,
+            url_base='https://api.bitbucket.org/2.0/repositories/test_workspace/test_repository')
+
+        response_1 = mock_response({
+            'next': f'{connection.url_base}/refs/branches?page=2',
+            'page': 1,
+            'pagelen': 2,
+            'size': 3,
+            'values': [{'name': 'branch_1'}, {'name': 'branch_2'}]})
+
+        response_2 = mock_response({
+            'page': 2,
+            'pagelen': 1,
+            'size': 3,
+            'values': [{'name': 'branch_3'}]})
+
+        session.get.side_effect = [
+            response_1,
+            response_2]
+
+        pages = src.bitbucket.tool.Pages(
+            connection=connection,
+            url=f'{connection.url_base}/refs/branches',
+            resource=src.bitbucket.resource.Branch)
+
+        # Act
+        first = next(pages)
+        pages.response_next.result()
+
+        # Assert
+        self.assertEqual(first.name, 'branch_1')
+        self.assertEqual(session.get.call_count, 2)
+        self.assertEqual([branch.name for branch in pages], ['branch_2', 'branch_3'])
+        self.assertEqual(session.get.call_count, 2)
+
+    def test_get_page_without_prefetch(self):
+        """With prefetch disabled the next page is only requested once it is needed"""
+        # Arrange
+        session = Mock()
+        connection = src.bitbucket.tool.Connection(
+            session=session,
+            url_base='https://api.bitbucket.org/2.0/repositories/test_workspace/test_repository')
+
+        session.get.side_effect = [
+            mock_response({
+                'next': f'{connection.url_base}/commits?page=2',
+                'page': 1,
+                'pagelen': 1,
+                'values': [{'hash': 'a' * 40}]})]
+
+        pages = src.bitbucket.tool.Pages(
+            connection=connection,
+            url=f'{connection.url_base}/commits',
+            resource=src.bitbucket.resource.Commit,
+            prefetch=False)
+
+        # Act
+        commit = next(pages)
+
+        # Assert
+        self.assertEqual(commit.hash, 'a' * 40)
+        self.assertIsNone(pages.response_next)
+        self.assertEqual(session.get.call_count, 1)
+
+    def test_get_page_parallel(self):
+        """When the first page reports the total size the remaining pages
+        are all requested up front and resources still come back in order
+        """
+        # Arrange
+        session = Mock()
+        connection = src.bitbucket.tool.Connection(
+            session=session,
+            url_base='https://api.bitbucket.org/2.0/repositories/test_workspace/test_repository')
+
+        pages_by_number = {
+            page: mock_response({
+                'next': f'{connection.url_base}/refs/tags?page={page + 1}',
+                'page': page,
+                'pagelen': 2,
+                'size': 7,
+                'values': [
+                    {'name': f'tag_{number}'}
+                    for number in range(page * 2 - 1, min(page * 2, 7) + 1)]})
+            for page in range(1, 5)}
+
+        session.get.side_effect = (
+            lambda url, params=None: pages_by_number[(params or {}).get('page', 1)])
+
+        pages = src.bitbucket.tool.Pages(
+            connection=connection,
+            url=f'{connection.url_base}/refs/tags',
+            resource=src.bitbucket.resource.Tag,
+            parallel=True)
+
+        # Act
+        resources = list(pages)
+
+        # Assert
+        self.assertEqual(session.get.call_count, 4)
+        self.assertEqual([tag.name for tag in resources], [f'tag_{number}' for number in range(1, 8)])
+
+    def test_get_page_async(self):
+        """Pages can be consumed with "async for" across multiple pages"""
+        # Arrange
+        session = Mock()
+        connection = src.bitbucket.tool.Connection(
+            session=session,
+            url_base='https://api.bitbucket.org/2.0/repositories/test_workspace/test_repository')
+
+        session.get.side_effect = [
+            mock_response({
+                'next': f'{connection.url_base}/refs/branches?page=2',
+                'page': 1,
+                'pagelen': 2,
+                'values': [{'name': 'branch_1'}, {'name': 'branch_2'}]}),
+            mock_response({
+                'page': 2,
+                'pagelen': 2,
+                'values': [{'name': 'branch_3'}]})]
+
+        pages = src.bitbucket.tool.Pages(
+            connection=connection,
+            url=f'{connection.url_base}/refs/branches',
+            resource=src.bitbucket.resource.Branch)
+
+        async def collect():
+            return [branch.name async for branch in pages]
+
+        # Act
+        names = asyncio.run(collect())
+
+        # Assert
+        self.assertEqual(session.get.call_count, 2)
+        self.assertEqual(names, ['branch_1', 'branch_2', 'branch_3'])
+
+    def test_rate_limiter_waits_when_empty(self):
+        """RateLimiter only sleeps once the burst is used up"""
+        # Arrange
+        limiter = src.bitbucket.tool.RateLimiter(rate=10, burst=2)
+
+        # Act
+        with patch('time.sleep') as sleep:
+            limiter.acquire()
+            limiter.acquire()
+            sleep.assert_not_called()
+            limiter.acquire()
+
+        # Assert
+        sleep.assert_called_once()
+        self.assertAlmostEqual(sleep.call_args[0][0], 0.1, places=2)
+
+    def test_ttl_lru_cache_expires(self):
+        """ttl_lru_cache reuses results within ttl seconds and refetches after"""
+        # Arrange
+        fetch = Mock(side_effect=lambda url: {'url': url})
+        cached_fetch = src.bitbucket.tool.ttl_lru_cache(maxsize=8, ttl=60)(fetch)
+
+        # Act
+        with patch('time.monotonic', return_value=0.0):
+            cached_fetch('branch_1')
+            cached_fetch('branch_1')
+        with patch('time.monotonic', return_value=61.0):
+            cached_fetch('branch_1')
+
+        # Assert
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_check_response_raises_error_class(self):
+        """check_response passes successful responses and raises error_class otherwise"""
+        # Arrange
+        found = Mock(status_code=200)
+        missing = Mock(status_code=404)
+        missing.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            '404 Client Error', response=missing)
+
+        # Act
+        src.bitbucket.tool.check_response(found, src.bitbucket.exceptions.ObjectDoesNotExist)
+
+        # Assert
+        found.raise_for_status.assert_not_called()
+        with self.assertRaises(src.bitbucket.exceptions.ObjectDoesNotExist):
+            src.bitbucket.tool.check_response(
+                missing, src.bitbucket.exceptions.ObjectDoesNotExist)
+
+    def test_connection_defaults_to_shared_session(self):
+        """Connections built without a session share one pooled session"""
+        # Act
+        connection_1 = src.bitbucket.tool.Connection(url_base='https://api.bitbucket.org/2.0')
+        connection_2 = src.bitbucket.tool.Connection(url_base='https://api.bitbucket.org/2.0')
+
+        # Assert
+        self.assertIs(connection_1.session, connection_2.session)
+        self.assertIs(connection_1.session, src.bitbucket.tool.default_session())
+
+    def test_close_cancels_prefetch(self):
+        """Closing Pages part way cancels the pending prefetch and ends iteration"""
+        # Arrange
+        session = Mock()
+        connection = src.bitbucket.tool.Connection(
+            session=session,
+            url_base='https://api.bitbucket.org/2.0/repositories/test_workspace/test_repository')
+
+        session.get.return_value = mock_response({
+            'next': f'{connection.url_base}/refs/branches?page=2',
+            'page': 1,
+            'pagelen': 2,
+            'values': [{'name': 'branch_1'}, {'name': 'branch_2'}]})
+
+        pages = src.bitbucket.tool.Pages(
+            connection=connection,
+            url=f'{connection.url_base}/refs/branches',
+            resource=src.bitbucket.resource.Branch)
+
+        # Act
+        with pages:
+            first = next(pages)
+            response_next = pages.response_next = Mock()
+
+        # Assert
+        self.assertEqual(first.name, 'branch_1')
+        response_next.cancel.assert_called_once()
+        self.assertEqual(list(pages), [])